@@ -269,7 +269,7 @@ class ServerConfig:
     @classmethod
     def from_file(cls, config_file: str) -> "ServerConfig":
         """Load configuration from a JSON or YAML file."""
-        import json
+        import pydantic_core
         
         config_path = Path(config_file)
         if not config_path.exists():
@@ -277,7 +277,7 @@ class ServerConfig:
         
         with open(config_path, 'r', encoding='utf-8') as f:
             if config_path.suffix.lower() == '.json':
-                config_data = json.load(f)
+                config_data = pydantic_core.from_json(f.read())
             elif config_path.suffix.lower() in ['.yml', '.yaml']:
                 try:
                     import yaml
@@ -327,14 +327,14 @@ class ServerConfig:
     
     def save_to_file(self, config_file: str):
         """Save configuration to a file."""
-        import json
+        import pydantic_core
         
         config_path = Path(config_file)
         config_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(config_path, 'w', encoding='utf-8') as f:
             if config_path.suffix.lower() == '.json':
-                json.dump(self.to_dict(), f, indent=2)
+                f.write(pydantic_core.to_json(self.to_dict(), indent=2).decode())
             elif config_path.suffix.lower() in ['.yml', '.yaml']:
                 try:
                     import yaml
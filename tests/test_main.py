@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the MCP tools in selenium_mcp_server.main
+
+Tool bodies are called directly (as registered by ``_threaded``) against a mocked
+WebDriver, so no browser is needed.
+"""
+
+import base64
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+from selenium.common.exceptions import (  # noqa: E402
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from selenium_mcp_server import main  # noqa: E402
+from selenium_mcp_server.browser_manager import BrowserManager  # noqa: E402
+
+SESSION_KEY = ("chrome", True, (1920, 1080), "normal")
+PNG = b"\x89PNG\r\n\x1a\nfake"
+
+
+def call_tool(name: str, **kwargs):
+    """Run a tool's blocking body in the calling thread."""
+    return main._TOOL_FUNCS[name](**kwargs)
+
+
+class FakeClock:
+    """Stands in for main.time: sleep() advances monotonic() instead of blocking."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ToolTestCase(unittest.TestCase):
+    """Base class installing a fresh BrowserManager with one mocked Chrome session."""
+
+    def setUp(self):
+        """Set up a current session backed by a mocked driver."""
+        self.manager = BrowserManager()
+        patcher = patch.object(main, "browser_manager", self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(main._element_cache.clear)
+        main._element_cache.clear()
+
+        self.element = Mock()
+        self.script_result = None
+        self.driver = self.add_session("browser-1")
+
+    def add_session(self, browser_id: str) -> Mock:
+        """Register a mocked driver as the current session."""
+        driver = Mock()
+        driver.capabilities = {"browserName": "chrome"}
+
+        def execute_script(script, *args):
+            if script.startswith("return [location.href"):
+                return ["https://example.com/", "Example"]
+            if "? [true, " in script:
+                # _run_on_element: locate and evaluate in one call
+                return [self.element is not None, self.script_result]
+            return self.element
+
+        driver.execute_script.side_effect = execute_script
+        with self.manager._lock:
+            self.manager._register(browser_id, SESSION_KEY, driver)
+        return driver
+
+
+class TestNoBrowser(unittest.TestCase):
+    """Test cases for tools called without an active session."""
+
+    def test_returns_standard_error(self):
+        """Test that browser tools fail with the shared no-browser payload."""
+        with patch.object(main, "browser_manager", BrowserManager()):
+            result = call_tool("selenium_click", strategy="id", value="submit")
+
+        self.assertEqual(result, dict(main._NO_BROWSER_ERR))
+        self.assertIsNot(result, main._NO_BROWSER_ERR)
+
+
+class TestElementCache(ToolTestCase):
+    """Test cases for reusing located elements between tool calls."""
+
+    def test_miss_then_hit(self):
+        """Test that a repeated locator skips the second lookup."""
+        for text in ("first", "second"):
+            result = call_tool("selenium_type", strategy="id", value="q", text=text)
+            self.assertTrue(result["success"])
+
+        self.assertEqual(self.driver.execute_script.call_count, 1)
+        self.assertEqual(self.element.send_keys.call_count, 2)
+
+    def test_click_invalidates(self):
+        """Test that a click, which may navigate, drops cached elements."""
+        call_tool("selenium_click", strategy="id", value="submit")
+        call_tool("selenium_click", strategy="id", value="submit")
+
+        self.assertEqual(self.driver.execute_script.call_count, 2)
+
+    def test_expired_entry_is_located_again(self):
+        """Test that entries older than the TTL are not served."""
+        with patch.object(main, "_ELEMENT_CACHE_TTL", -1.0):
+            call_tool("selenium_hover", strategy="id", value="menu")
+            call_tool("selenium_hover", strategy="id", value="menu")
+
+        self.assertEqual(self.driver.execute_script.call_count, 2)
+
+    def test_navigation_invalidates(self):
+        """Test that navigating drops the session's cached elements."""
+        call_tool("selenium_type", strategy="id", value="q", text="selenium")
+        self.assertIn(("browser-1", "id", "q"), main._element_cache)
+
+        self.assertTrue(call_tool("selenium_navigate", url="https://example.com/")["success"])
+        self.assertEqual(len(main._element_cache), 0)
+
+    def test_entries_are_keyed_by_session(self):
+        """Test that sessions never share cached elements."""
+        call_tool("selenium_hover", strategy="id", value="menu")
+        other = self.add_session("browser-2")
+        call_tool("selenium_hover", strategy="id", value="menu")
+
+        self.assertEqual(other.execute_script.call_count, 1)
+        self.assertEqual(
+            set(main._element_cache),
+            {("browser-1", "id", "menu"), ("browser-2", "id", "menu")}
+        )
+
+        main._invalidate_elements("browser-2")
+        self.assertEqual(set(main._element_cache), {("browser-1", "id", "menu")})
+
+    def test_stale_element_is_located_again(self):
+        """Test that a stale cached reference is re-located once."""
+        call_tool("selenium_type", strategy="id", value="q", text="first")
+        self.element.clear.side_effect = [StaleElementReferenceException(), None]
+
+        result = call_tool("selenium_type", strategy="id", value="q", text="second")
+        self.assertTrue(result["success"])
+        self.assertEqual(self.driver.execute_script.call_count, 2)
+
+    def test_missing_element(self):
+        """Test that a locator with no match reports NoSuchElementException."""
+        self.element = None
+        result = call_tool("selenium_click", strategy="css_selector", value=".missing")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error_type"], "NoSuchElementException")
+
+
+class TestElementSummary(ToolTestCase):
+    """Test cases for the fused element summary."""
+
+    def test_displayed_runs_selenium_atom(self):
+        """Test that the summary reports visibility with the atom is_displayed() uses."""
+        summary = {"tag": "button", "text": "Go", "displayed": True, "enabled": True}
+        self.script_result = [self.element, summary]
+        result = call_tool("selenium_find_element", strategy="id", value="go")
+
+        self.assertTrue(result["is_displayed"])
+        script = self.driver.execute_script.call_args.args[0]
+        self.assertIn(main._selenium_atom("isDisplayed.js"), script)
+
+
+class TestStartBrowser(ToolTestCase):
+    """Test cases for selenium_start_browser."""
+
+    def test_reuse_session_invalidates_cache(self):
+        """Test that a reused session loses elements cached from its old page."""
+        call_tool("selenium_hover", strategy="id", value="menu")
+
+        result = call_tool("selenium_start_browser", headless=True, reuse_session=True)
+
+        self.assertEqual(result["browser_id"], "browser-1")
+        self.driver.get.assert_called_once_with("about:blank")
+        self.assertEqual(len(main._element_cache), 0)
+
+
+class TestFindElementWithTimeout(unittest.TestCase):
+    """Test cases for the exponential back-off in _find_element_with_timeout."""
+
+    def setUp(self):
+        """Set up a fake clock and a driver whose lookups miss."""
+        self.clock = FakeClock()
+        patcher = patch.object(main, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.browser = Mock()
+        self.browser.find_element.side_effect = NoSuchElementException()
+
+    def test_found_after_misses(self):
+        """Test that the first retries come quickly and the element is returned."""
+        element = Mock()
+        self.browser.find_element.side_effect = [
+            NoSuchElementException(), NoSuchElementException(), element
+        ]
+
+        self.assertIs(main._find_element_with_timeout(self.browser, By.ID, "q", 5), element)
+        self.assertEqual(self.clock.sleeps, [0.05, 0.1])
+
+    def test_interval_doubles_up_to_cap(self):
+        """Test that the interval doubles to _POLL_MAX and the last sleep ends at the deadline."""
+        with self.assertRaises(TimeoutException):
+            main._find_element_with_timeout(self.browser, By.ID, "q", 10)
+
+        expected = [0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 2.0, 2.0, 2.0, 0.85]
+        self.assertEqual(len(self.clock.sleeps), len(expected))
+        for slept, interval in zip(self.clock.sleeps, expected):
+            self.assertAlmostEqual(slept, interval)
+        self.assertAlmostEqual(self.clock.now, 10)
+
+    def test_zero_timeout_tries_once(self):
+        """Test that an exhausted timeout still makes one lookup, without sleeping."""
+        with self.assertRaises(TimeoutException):
+            main._find_element_with_timeout(self.browser, By.ID, "q", 0)
+
+        self.browser.find_element.assert_called_once_with(By.ID, "q")
+        self.assertEqual(self.clock.sleeps, [])
+
+
+class TestWaitForElement(ToolTestCase):
+    """Test cases for selenium_wait_for_element."""
+
+    SUMMARY = {"tag": "div", "text": "Ready", "displayed": True, "enabled": True}
+
+    def setUp(self):
+        """Set up a fake clock and a polling fallback that finds the element."""
+        super().setUp()
+        self.clock = FakeClock()
+        patcher = patch.object(main, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.driver.execute_script.side_effect = lambda script, *args: self.SUMMARY
+        self.driver.find_element.return_value = self.element
+
+    def wait(self, **kwargs):
+        """Wait for #ready and return the tool result."""
+        return call_tool("selenium_wait_for_element", strategy="id", value="ready", **kwargs)
+
+    def test_observer_hit(self):
+        """Test that an in-page observer match returns without polling the driver."""
+        self.driver.execute_async_script.return_value = [self.element, self.SUMMARY]
+        result = self.wait(timeout=5)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["tag_name"], "div")
+        self.assertEqual(self.driver.execute_async_script.call_args.args[1:], ("ready", 5000))
+        self.driver.find_element.assert_not_called()
+        self.assertIn(("browser-1", "id", "ready"), main._element_cache)
+
+    def test_script_error_falls_back_to_polling(self):
+        """Test that a replaced document falls back to polling for the time left."""
+        def navigated(*args):
+            self.clock.now += 3
+            raise JavascriptException("document unloaded")
+
+        self.driver.execute_async_script.side_effect = navigated
+        with patch.object(
+            main, "_find_element_with_timeout", return_value=self.element
+        ) as find:
+            result = self.wait(timeout=5)
+
+        self.assertTrue(result["success"])
+        find.assert_called_once_with(self.driver, By.ID, "ready", 2)
+
+    def test_deadline_expiry(self):
+        """Test that an observer timing out reports TimeoutException without polling."""
+        def timed_out(*args):
+            self.clock.now += 5
+
+        self.driver.execute_async_script.side_effect = timed_out
+        result = self.wait(timeout=5)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error_type"], "TimeoutException")
+        self.driver.find_element.assert_not_called()
+
+    def test_long_timeout_polls(self):
+        """Test that waits past the script timeout poll instead of using an observer."""
+        with patch.object(
+            main, "_find_element_with_timeout", return_value=self.element
+        ) as find:
+            result = self.wait(timeout=main._OBSERVER_MAX_WAIT + 5)
+
+        self.assertTrue(result["success"])
+        self.driver.execute_async_script.assert_not_called()
+        find.assert_called_once_with(self.driver, By.ID, "ready", main._OBSERVER_MAX_WAIT + 5)
+
+
+class TestBatchExecute(ToolTestCase):
+    """Test cases for selenium_batch_execute."""
+
+    OPERATIONS = [
+        {"name": "selenium_navigate", "arguments": {"url": "https://example.com/"}},
+        {"name": "selenium_click", "arguments": {"strategy": "id", "value": "missing"}},
+        {"name": "selenium_get_current_url"},
+    ]
+
+    def setUp(self):
+        """Make every locator miss so the click operation fails."""
+        super().setUp()
+        self.element = None
+
+    def test_stops_on_first_error(self):
+        """Test that the batch stops at the failing operation by default."""
+        result = call_tool("selenium_batch_execute", operations=self.OPERATIONS)
+
+        self.assertFalse(result["success"])
+        self.assertEqual((result["completed"], result["total"]), (2, 3))
+        self.assertTrue(result["results"][0]["result"]["success"])
+        self.assertFalse(result["results"][1]["result"]["success"])
+
+    def test_continues_past_errors(self):
+        """Test that stop_on_error=False runs every operation."""
+        result = call_tool(
+            "selenium_batch_execute", operations=self.OPERATIONS, stop_on_error=False
+        )
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["completed"], 3)
+        self.assertEqual(result["message"], "2/3 operations succeeded")
+
+    def test_unknown_tool_and_bad_arguments(self):
+        """Test that unknown tools and invalid arguments fail only their own operation."""
+        result = call_tool("selenium_batch_execute", stop_on_error=False, operations=[
+            {"name": "selenium_batch_execute"},
+            {"name": "selenium_navigate", "arguments": {"href": "https://example.com/"}},
+        ])
+
+        first, second = (entry["result"] for entry in result["results"])
+        self.assertEqual(first["error"], "Unknown tool: selenium_batch_execute")
+        self.assertEqual(second["error_type"], "TypeError")
+
+
+class TestGetAttribute(ToolTestCase):
+    """Test cases for selenium_get_attribute."""
+
+    def test_js_strategy_runs_selenium_atom(self):
+        """Test that JS-located reads run the atom WebElement.get_attribute uses."""
+        self.script_result = "true"
+        result = call_tool("selenium_get_attribute", strategy="id", value="c", attribute="checked")
+
+        self.assertEqual(result["value"], "true")
+        script, *args = self.driver.execute_script.call_args.args
+        self.assertIn(main._selenium_atom("getAttribute.js"), script)
+        self.assertEqual(args, ["c", "checked"])
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    os.getenv("SKIP_INTEGRATION_TESTS", "false").lower() == "true",
+    reason="Integration tests disabled"
+)
+class TestGetAttributeInBrowser(unittest.TestCase):
+    """Test that JS and WebDriver lookups agree on live boolean attributes in Chrome."""
+
+    PAGE = "data:text/html,<input type=checkbox id=c name=c checked>"
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one headless Chrome session, or skip when none can be launched."""
+        cls.manager = BrowserManager()
+        try:
+            cls.manager.start_browser(headless=True)
+        except Exception as e:
+            raise unittest.SkipTest(f"Chrome unavailable: {e}")
+        cls.patcher = patch.object(main, "browser_manager", cls.manager)
+        cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the session."""
+        cls.patcher.stop()
+        cls.manager.stop_all_browsers()
+
+    def setUp(self):
+        """Load a checkbox that is checked by default."""
+        main._element_cache.clear()
+        self.assertTrue(call_tool("selenium_navigate", url=self.PAGE)["success"])
+
+    def get_checked(self, strategy: str):
+        """Read the checkbox's checked attribute through selenium_get_attribute."""
+        return call_tool(
+            "selenium_get_attribute", strategy=strategy, value="c", attribute="checked"
+        )["value"]
+
+    def test_unchecked_default_checked_box(self):
+        """Test that unchecking a default-checked box reads as None on every path."""
+        self.assertEqual(self.get_checked("id"), "true")
+        _, driver = self.manager.get_current()
+        driver.execute_script("document.getElementById('c').checked = false;")
+
+        self.assertIsNone(self.get_checked("id"))
+        self.assertIsNone(self.get_checked("name"))
+
+
+class TestGetText(ToolTestCase):
+    """Test cases for selenium_get_text."""
+
+    def test_truncation_flag_comes_from_browser(self):
+        """Test that the truncated flag is the one computed in the page."""
+        self.script_result = ["abc", 10, True]
+        result = call_tool("selenium_get_text", strategy="id", value="body", max_chars=3)
+
+        self.assertEqual(result["text"], "abc")
+        self.assertEqual(result["length"], 10)
+        self.assertTrue(result["truncated"])
+
+    def test_no_flag_without_limit(self):
+        """Test that an unlimited read omits the truncated flag."""
+        self.script_result = ["abc", 3, False]
+        result = call_tool("selenium_get_text", strategy="id", value="body")
+
+        self.assertEqual(result["text"], "abc")
+        self.assertNotIn("truncated", result)
+
+    def test_webdriver_strategy_reads_text_in_page(self):
+        """Test that non-JS strategies use the same in-page text and length as JS ones."""
+        self.driver.find_elements.return_value = [self.element]
+        self.driver.execute_script.side_effect = lambda script, *args: ["😀", 2, False]
+        result = call_tool("selenium_get_text", strategy="name", value="q")
+
+        self.assertEqual((result["text"], result["length"]), ("😀", 2))
+        script, *args = self.driver.execute_script.call_args.args
+        self.assertIn(main._JS_TEXT, script)
+        self.assertEqual(args, [self.element, 0])
+        self.assertNotIn("truncated", result)
+
+
+class TestExecuteScript(ToolTestCase):
+    """Test cases for shaping selenium_execute_script results in the browser."""
+
+    SCRIPT = "return document.body.innerHTML; // trailing comment"
+
+    def setUp(self):
+        """Set up a driver that echoes a script result."""
+        super().setUp()
+        self.driver.execute_script.side_effect = None
+        self.driver.execute_script.return_value = "<p>hello</p>"
+
+    def sent_script(self) -> str:
+        """The script actually sent to the driver."""
+        self.driver.execute_script.assert_called_once()
+        return self.driver.execute_script.call_args.args[0]
+
+    def test_script_sent_unchanged_by_default(self):
+        """Test that a plain call sends the script as written."""
+        result = call_tool("selenium_execute_script", script=self.SCRIPT)
+
+        self.assertEqual(result["result"], "<p>hello</p>")
+        self.assertEqual(self.sent_script(), self.SCRIPT)
+
+    def test_result_limit_slices_in_browser(self):
+        """Test that result_limit wraps the script and slices string results in the page."""
+        call_tool("selenium_execute_script", script=self.SCRIPT, result_limit=5)
+
+        wrapped = self.sent_script()
+        # The newline keeps a trailing line comment from swallowing the wrapper
+        self.assertIn(f"(function () {{ {self.SCRIPT}\n}}).apply(this, arguments);", wrapped)
+        self.assertIn("r.slice(0, 5)", wrapped)
+
+    def test_discard_result(self):
+        """Test that discard_result runs the script but returns null from the page."""
+        self.driver.execute_script.return_value = None
+        result = call_tool(
+            "selenium_execute_script", script=self.SCRIPT, result_limit=5, discard_result=True
+        )
+
+        self.assertTrue(result["success"])
+        self.assertIsNone(result["result"])
+        self.assertEqual(
+            self.sent_script(),
+            f"(function () {{ {self.SCRIPT}\n}}).apply(this, arguments); return null;"
+        )
+
+    def test_invalidates_cached_elements(self):
+        """Test that scripts, which may change the DOM, drop cached elements."""
+        main._remember_element("browser-1", "id", "q", self.element)
+        call_tool("selenium_execute_script", script="document.body.innerHTML = '';")
+
+        self.assertEqual(len(main._element_cache), 0)
+
+
+class TestTakeScreenshot(ToolTestCase):
+    """Test cases for selenium_take_screenshot."""
+
+    def setUp(self):
+        """Set up PNG data on both screenshot paths and a scratch directory."""
+        super().setUp()
+        self.png_b64 = base64.b64encode(PNG).decode()
+        self.driver.execute_cdp_cmd.return_value = {"data": self.png_b64}
+        self.driver.get_screenshot_as_base64.return_value = self.png_b64
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_chromium_uses_cdp(self):
+        """Test that Chromium screenshots come straight from CDP without a file."""
+        result = call_tool("selenium_take_screenshot", return_base64=True)
+
+        self.assertEqual(result["base64_data"], self.png_b64)
+        self.assertNotIn("filename", result)
+        self.driver.execute_cdp_cmd.assert_called_once_with(
+            "Page.captureScreenshot", {"format": "png"}
+        )
+        self.driver.get_screenshot_as_base64.assert_not_called()
+
+    def test_saves_file(self):
+        """Test that the decoded PNG is written, creating missing directories."""
+        self.driver.capabilities = {"browserName": "firefox"}
+        filename = os.path.join(self.tmpdir.name, "shots", "page.png")
+        result = call_tool("selenium_take_screenshot", filename=filename)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["size"], len(PNG))
+        self.assertNotIn("base64_data", result)
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), PNG)
+
+
+class TestMain(unittest.TestCase):
+    """Test cases for the server entry point."""
+
+    def test_stops_browsers_after_normal_exit(self):
+        """Test that sessions are cleaned up when mcp.run() simply returns."""
+        with patch.object(main, "mcp") as mcp, patch.object(main, "browser_manager") as manager:
+            main.main()
+
+        mcp.run.assert_called_once_with()
+        manager.stop_all_browsers.assert_called_once_with()
+
+    def test_stops_browsers_on_error(self):
+        """Test that sessions are cleaned up and the server error is re-raised."""
+        with patch.object(main, "mcp") as mcp, patch.object(main, "browser_manager") as manager:
+            mcp.run.side_effect = RuntimeError("transport closed")
+            with self.assertRaises(RuntimeError):
+                main.main()
+
+        manager.stop_all_browsers.assert_called_once_with()
+
+
+class TestDownloadFile(unittest.TestCase):
+    """Test cases for selenium_download_file."""
+
+    def setUp(self):
+        """Set up a shared HTTP session serving two chunks and a scratch directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.response = MagicMock()
+        self.response.__enter__.return_value = self.response
+        self.response.iter_content.return_value = iter([b"abc", b"de"])
+        self.session = Mock()
+        self.session.get.return_value = self.response
+        patcher = patch.object(main, "_get_http_session", return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_streams_to_file(self):
+        """Test that the body is streamed to disk chunk by chunk over the shared session."""
+        filename = os.path.join(self.tmpdir.name, "data.bin")
+        result = call_tool("selenium_download_file", url="https://example.com/d", filename=filename)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["size"], 5)
+        self.session.get.assert_called_once_with(
+            "https://example.com/d", stream=True, timeout=(5, 30)
+        )
+        self.response.iter_content.assert_called_once_with(chunk_size=main._DOWNLOAD_CHUNK)
+        self.response.__exit__.assert_called_once()
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), b"abcde")
+
+    def test_filename_from_url_path(self):
+        """Test that default filenames ignore the query string and fragment."""
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        self.addCleanup(os.chdir, cwd)
+
+        for url, expected in [
+            ("https://example.com/files/report.pdf?token=abc#page=2", "report.pdf"),
+            ("https://example.com/", "downloaded_file"),
+        ]:
+            self.response.iter_content.return_value = iter([b"x"])
+            result = call_tool("selenium_download_file", url=url)
+            self.assertEqual(result["filename"], expected)
+            self.assertTrue(os.path.isfile(expected))
+
+    def test_http_error_leaves_no_file(self):
+        """Test that an HTTP error is reported and nothing is written."""
+        self.response.raise_for_status.side_effect = RuntimeError("404 Client Error")
+        filename = os.path.join(self.tmpdir.name, "missing.bin")
+        result = call_tool("selenium_download_file", url="https://example.com/x", filename=filename)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test cases for _atomic_write."""
+
+    def setUp(self):
+        """Set up a target file with existing content."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "out.bin")
+        with open(self.path, "wb") as f:
+            f.write(b"old")
+
+    def test_replaces_file(self):
+        """Test that the new content replaces the file and no temporary file remains."""
+        with main._atomic_write(self.path) as f:
+            f.write(b"new")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"new")
+        self.assertEqual(os.listdir(self.tmpdir.name), ["out.bin"])
+
+    def test_failure_keeps_original(self):
+        """Test that a failed write leaves the original file and cleans up."""
+        with self.assertRaises(RuntimeError):
+            with main._atomic_write(self.path) as f:
+                f.write(b"partial")
+                raise RuntimeError("interrupted")
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertEqual(os.listdir(self.tmpdir.name), ["out.bin"])
+
+
+class TestSerializeResult(unittest.TestCase):
+    """Test cases for the tool result serializer."""
+
+    def test_compact_json_with_fallback(self):
+        """Test that results are compact JSON and unknown objects become strings."""
+        self.assertEqual(
+            main._serialize_result({"success": True, "value": Ellipsis}),
+            '{"success":true,"value":"Ellipsis"}'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()